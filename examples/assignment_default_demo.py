@@ -32,8 +32,14 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'source'))
 from portfolio.optimizer import PortfolioOptimizer
 from portfolio.data_handler import DataHandler
 from portfolio.static_data_handler import StaticDataHandler
-from utils.plotting import PortfolioPlotter
-import matplotlib.pyplot as plt
+from joblib import Memory
+
+# matplotlib and the plotter are imported inside generate_visualizations so a
+# failed analysis or early exit never pays their import cost
+
+# On-disk cache for WRDS fetches so re-runs during development skip the
+# 2-3 minute network query. Delete .cache/ipo to force a refresh.
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'ipo')
 
 def main():
     """
@@ -87,9 +93,16 @@ def main():
     print()
     
     print("Connecting to WRDS and running optimization...")
-    print("This may take 2-3 minutes for the full analysis...")
-    
+    print("This may take 2-3 minutes for the full analysis (instant on cached re-runs)...")
+
     try:
+        # Fetch returns through the on-disk cache, keyed on (tickers, start, end)
+        memory = Memory(CACHE_DIR, verbose=0)
+        cached_fetch = memory.cache(DataHandler.fetch_stock_returns, ignore=['self', 'db_connection'])
+        returns_data = cached_fetch(data_handler, sorted(default_tickers), '2010-01-01', '2024-12-31')
+        if returns_data is not None:
+            optimizer.returns_data = returns_data
+
         # Execute complete analysis
         results = optimizer.run_complete_analysis()
         
@@ -174,7 +187,10 @@ def print_results(results):
 
 def generate_visualizations(results, optimizer):
     """Generate and display all visualizations"""
-    
+
+    import matplotlib.pyplot as plt
+    from utils.plotting import PortfolioPlotter
+
     print("Generating visualizations...")
     print("Three popup windows will appear:")
     print("1. Performance Dashboard - Comprehensive analysis overview")
@@ -14,13 +14,16 @@ try:
     from portfolio.optimizer import PortfolioOptimizer
     from portfolio.data_handler import DataHandler
     from portfolio.static_data_handler import StaticDataHandler
-    from utils.plotting import PortfolioPlotter
-    from ai.local_ai_analyzer import LocalAIPortfolioAnalyzer
 except ImportError as e:
     print(f"Import Error: {e}")
     print("Please ensure the LocalAIPortfolioAnalyzer is saved in source/ai/local_analyzer.py")
     sys.exit(1)
 
+from joblib import Memory
+
+# On-disk cache for WRDS fetches so re-runs during development skip the network
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'ipo')
+
 
 def main():
     """Main demo function using your existing classes."""
@@ -62,8 +65,15 @@ def main():
         # Step 3: Run analysis
         print("\nSTEP 3: Running Portfolio Analysis")
         print("-" * 40)
-        print("This may take a few minutes...")
-        
+        print("This may take a few minutes (instant on cached re-runs)...")
+
+        # Fetch returns through the on-disk cache, keyed on (tickers, start, end)
+        memory = Memory(CACHE_DIR, verbose=0)
+        cached_fetch = memory.cache(DataHandler.fetch_stock_returns, ignore=['self', 'db_connection'])
+        returns_data = cached_fetch(data_handler, sorted(optimizer.tickers), '2020-01-01', '2023-12-31')
+        if returns_data is not None:
+            optimizer.returns_data = returns_data
+
         results = optimizer.run_complete_analysis()
         
         if results['success']:
@@ -79,6 +89,9 @@ def main():
             use_ai = input("Generate AI analysis? [y/N]: ").strip().lower()
             
             if use_ai == 'y':
+                # Deferred import: loading the local model stack is expensive
+                # and pointless when the user answers "N"
+                from ai.local_ai_analyzer import LocalAIPortfolioAnalyzer
                 ai_analyzer = LocalAIPortfolioAnalyzer()
                 
                 ai_report = ai_analyzer.generate_complete_report(
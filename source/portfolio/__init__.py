@@ -7,11 +7,13 @@ from .optimizer import PortfolioOptimizer
 from .data_handler import DataHandler
 from .static_data_handler import StaticDataHandler
 from .covariance import CovarianceEstimator
+from .rolling_covariance import RollingCovariance
 from .metrics import PerformanceAnalyzer
 
 __all__ = [
     "PortfolioOptimizer",
-    "DataHandler", 
+    "DataHandler",
     "CovarianceEstimator",
+    "RollingCovariance",
     "PerformanceAnalyzer"
 ]
\ No newline at end of file
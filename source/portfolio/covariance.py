@@ -8,9 +8,44 @@ import pandas as pd
 import numpy as np
 import cvxpy as cp
 import logging
-from sklearn.covariance import LedoitWolf
 from typing import Dict, List, Tuple, Optional, Union
 
+def ledoit_wolf_shrinkage_fast(centered_returns: np.ndarray) -> float:
+    """
+    Ledoit-Wolf shrinkage intensity from one BLAS-3 Gram matrix
+
+    Computes the same intensity as sklearn's ledoit_wolf_shrinkage but as
+    vectorized matrix products: the b^2 numerator needs sum_k ||x_k x_k' - S||_F^2,
+    whose cross term collapses to T*||S||_F^2 because S = (1/T) sum_k x_k x_k',
+    leaving only row-norm reductions.
+
+    Parameters:
+    -----------
+    centered_returns : np.ndarray
+        (T, n) matrix of return observations, centered column-wise
+
+    Returns:
+    --------
+    float
+        Shrinkage intensity in [0, 1]
+    """
+
+    X = np.asarray(centered_returns, dtype=np.float64)
+    t, n = X.shape
+
+    S = (X.T @ X) / t
+    m = np.trace(S) / n
+    d2 = np.sum((S - m * np.eye(n)) ** 2)
+
+    if d2 <= 0:
+        return 0.0
+
+    frob_S = np.sum(S ** 2)
+    b2_bar = (np.einsum('ij,ij->i', X, X) ** 2).sum() / t ** 2 - frob_S / t
+    b2 = min(max(b2_bar, 0.0), d2)
+
+    return b2 / d2
+
 class CovarianceEstimator:
     """
     Handles covariance matrix estimation and portfolio optimization
@@ -19,7 +54,22 @@ class CovarianceEstimator:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        
+
+    @staticmethod
+    def _center_window(clean_data: pd.DataFrame) -> Tuple[np.ndarray, pd.Series]:
+        """
+        Subtract column means once so both estimators share one centering pass
+
+        Returns:
+        --------
+        Tuple[np.ndarray, pd.Series]
+            (centered observation matrix, mean returns)
+        """
+        mean_returns = clean_data.mean()
+        X = clean_data.values - mean_returns.values
+        return X, mean_returns
+
+
     def calculate_sample_covariance(self, 
                                   returns_df: pd.DataFrame, 
                                   estimation_start: pd.Timestamp, 
@@ -62,9 +112,9 @@ class CovarianceEstimator:
         if clean_data.empty:
             raise ValueError("No valid data after cleaning")
             
-        # Calculate sample covariance matrix
-        sample_cov = clean_data.cov().values
-        mean_returns = clean_data.mean()
+        # Calculate sample covariance matrix from the pre-centered observations
+        X, mean_returns = self._center_window(clean_data)
+        sample_cov = (X.T @ X) / (len(X) - 1)
         
         self.logger.debug(f"Sample covariance calculated: {len(valid_tickers)} assets, {len(clean_data)} observations")
         
@@ -112,11 +162,13 @@ class CovarianceEstimator:
         if clean_data.empty:
             raise ValueError("No valid data after cleaning")
             
-        # Apply Ledoit-Wolf estimator
-        lw = LedoitWolf()
-        lw_cov = lw.fit(clean_data.values).covariance_
-        shrinkage = lw.shrinkage_
-        mean_returns = clean_data.mean()
+        # Apply Ledoit-Wolf estimator (fast shrinkage path, same result as sklearn)
+        X, mean_returns = self._center_window(clean_data)
+        emp_cov = (X.T @ X) / len(X)
+        shrinkage = ledoit_wolf_shrinkage_fast(X)
+        mu = np.trace(emp_cov) / emp_cov.shape[0]
+        lw_cov = (1.0 - shrinkage) * emp_cov
+        lw_cov.flat[::emp_cov.shape[0] + 1] += shrinkage * mu
         
         self.logger.debug(f"Ledoit-Wolf covariance calculated: {len(valid_tickers)} assets, shrinkage={shrinkage:.3f}")
         
@@ -343,7 +395,103 @@ class CovarianceEstimator:
                 
         return results
         
-    def calculate_efficient_frontier(self, 
+    def optimize_from_covariances(self,
+                                 sample_cov: Optional[np.ndarray],
+                                 lw_cov: Optional[np.ndarray],
+                                 shrinkage: Optional[float],
+                                 mean_returns: pd.Series,
+                                 tickers: List[str],
+                                 constraints: Optional[Dict] = None,
+                                 method: str = 'both') -> Dict:
+        """
+        Run the dual-method optimization from precomputed covariance matrices
+
+        Used by rolling backtests that maintain covariances incrementally
+        (see RollingCovariance) instead of re-estimating per window.
+
+        Parameters:
+        -----------
+        sample_cov : np.ndarray, optional
+            Sample covariance matrix (required for method 'sample'/'both')
+        lw_cov : np.ndarray, optional
+            Ledoit-Wolf covariance matrix (required for 'ledoit_wolf'/'both')
+        shrinkage : float, optional
+            Ledoit-Wolf shrinkage intensity
+        mean_returns : pd.Series
+            Mean returns over the estimation window
+        tickers : List[str]
+            Ticker names matching the covariance ordering
+        constraints : Dict, optional
+            Portfolio constraints
+        method : str
+            Which method(s) to run: 'sample', 'ledoit_wolf', or 'both'
+
+        Returns:
+        --------
+        Dict
+            Same structure as compare_methods
+        """
+
+        results = {}
+
+        if method in ['sample', 'both'] and sample_cov is not None:
+            try:
+                weights_sample, var_sample, status_sample = self.solve_minimum_variance_portfolio(
+                    sample_cov, constraints
+                )
+
+                if weights_sample is not None:
+                    portfolio_sample, metrics_sample = self.create_portfolio_summary(
+                        weights_sample, tickers, var_sample
+                    )
+
+                    results['sample'] = {
+                        'weights': weights_sample,
+                        'portfolio_variance': var_sample,
+                        'portfolio_positions': portfolio_sample,
+                        'metrics': metrics_sample,
+                        'tickers': tickers,
+                        'status': status_sample,
+                        'mean_returns': mean_returns
+                    }
+                else:
+                    results['sample'] = {'error': f'Optimization failed: {status_sample}'}
+
+            except Exception as e:
+                self.logger.error(f"Sample covariance method failed: {e}")
+                results['sample'] = {'error': str(e)}
+
+        if method in ['ledoit_wolf', 'both'] and lw_cov is not None:
+            try:
+                weights_lw, var_lw, status_lw = self.solve_minimum_variance_portfolio(
+                    lw_cov, constraints
+                )
+
+                if weights_lw is not None:
+                    portfolio_lw, metrics_lw = self.create_portfolio_summary(
+                        weights_lw, tickers, var_lw, shrinkage
+                    )
+
+                    results['ledoit_wolf'] = {
+                        'weights': weights_lw,
+                        'portfolio_variance': var_lw,
+                        'portfolio_positions': portfolio_lw,
+                        'metrics': metrics_lw,
+                        'tickers': tickers,
+                        'shrinkage': shrinkage,
+                        'status': status_lw,
+                        'mean_returns': mean_returns
+                    }
+                else:
+                    results['ledoit_wolf'] = {'error': f'Optimization failed: {status_lw}'}
+
+            except Exception as e:
+                self.logger.error(f"Ledoit-Wolf method failed: {e}")
+                results['ledoit_wolf'] = {'error': str(e)}
+
+        return results
+
+    def calculate_efficient_frontier(self,
                                    returns_df: pd.DataFrame,
                                    estimation_start: pd.Timestamp,
                                    estimation_end: pd.Timestamp,
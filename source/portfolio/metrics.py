@@ -71,9 +71,10 @@ class PerformanceAnalyzer:
             downside_deviation = negative_returns.std() * np.sqrt(12) if len(negative_returns) > 0 else 0
             sortino_ratio = (annualized_return - risk_free_rate) / downside_deviation if downside_deviation > 0 else 0
             
-            # Drawdown analysis
+            # Drawdown analysis (cummax is a single C pass; expanding().max()
+            # re-reduces the prefix per element)
             cumulative_returns = (1 + returns).cumprod()
-            running_max = cumulative_returns.expanding().max()
+            running_max = cumulative_returns.cummax()
             drawdown = (cumulative_returns - running_max) / running_max
             max_drawdown = drawdown.min()
             
@@ -530,9 +531,9 @@ class PerformanceAnalyzer:
                                          cumulative_returns: pd.Series) -> List[int]:
         """Calculate recovery times for drawdown periods"""
         
-        running_max = cumulative_returns.expanding().max()
+        running_max = cumulative_returns.cummax()
         drawdown = (cumulative_returns - running_max) / running_max
-        
+
         recovery_times = []
         in_drawdown = False
         drawdown_start = None
@@ -18,10 +18,47 @@ from typing import Dict, List, Tuple, Optional, Union
 from .data_handler import DataHandler
 from .static_data_handler import StaticDataHandler
 from .covariance import CovarianceEstimator
+from .rolling_covariance import RollingCovariance
 from .metrics import PerformanceAnalyzer
 
 warnings.filterwarnings('ignore')
 
+def _solve_backtest_window(covariance_estimator: CovarianceEstimator,
+                           filtered_returns: pd.DataFrame,
+                           final_tickers: List[str],
+                           constraints: Dict,
+                           est_start: pd.Timestamp,
+                           est_end: pd.Timestamp,
+                           oos_date: pd.Timestamp) -> Optional[Dict]:
+    """
+    Solve a single backtest window
+
+    Module-level so joblib process workers can pickle it; each worker gets its
+    own copy of the estimator and builds its own LedoitWolf instance.
+
+    Returns:
+    --------
+    Dict or None
+        compare_methods results, or None if the window should be skipped
+    """
+
+    if oos_date not in filtered_returns.index:
+        return None
+
+    oos_returns = filtered_returns.loc[oos_date]
+
+    # Skip if too many missing returns
+    if oos_returns.isna().sum() > len(final_tickers) * 0.2:
+        return None
+
+    return covariance_estimator.compare_methods(
+        returns_df=filtered_returns,
+        estimation_start=est_start,
+        estimation_end=est_end,
+        constraints=constraints,
+        method='both'
+    )
+
 class PortfolioOptimizer:
     """
     Modern Portfolio Theory optimizer with Ledoit-Wolf shrinkage estimation
@@ -126,9 +163,14 @@ class PortfolioOptimizer:
             Returns data with dates as index and tickers as columns
         """
         
+        # Reuse preloaded data (e.g. from a caller-side cache) instead of re-querying
+        if self.returns_data is not None and not self.returns_data.empty:
+            self.logger.info(f"Using preloaded returns data ({self.returns_data.shape[0]} periods, {self.returns_data.shape[1]} tickers)")
+            return self.returns_data
+
         start_date = f"{self.start_year}-01-01"
         end_date = f"{self.end_year}-12-31"
-        
+
         self.logger.info(f"Fetching data for {len(self.tickers)} assets ({start_date} to {end_date})")
         
         # Use data handler to fetch returns
@@ -275,145 +317,253 @@ class PortfolioOptimizer:
             method=method
         )
         
-    def run_backtest(self, save_progress: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def run_backtest(self,
+                    save_progress: bool = True,
+                    n_jobs: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Execute complete rolling window backtest
-        
+
         Parameters:
         -----------
         save_progress : bool
             Whether to show progress bar
-            
+        n_jobs : int
+            Number of worker processes for solving windows. The default of 1
+            keeps the serial path with the incremental covariance cache;
+            n_jobs=-1 uses all cores. Windows are independent QPs, so they
+            parallelize cleanly, but the solvers are not thread-safe - joblib's
+            loky process backend is used.
+
         Returns:
         --------
         Tuple[pd.DataFrame, pd.DataFrame]
             (backtest_results, portfolio_weights)
         """
-        
+
         # Validate everything is ready
         if self.returns_data is None:
             raise ValueError("Must fetch data before running backtest")
         if self.final_tickers is None:
             raise ValueError("Must validate tickers before running backtest")
-            
+
         # Generate backtest schedule
         backtest_dates = self.generate_backtest_dates()
-        
+
         if not backtest_dates:
             raise ValueError("Could not generate backtest dates")
-            
+
         self.logger.info(f"Running backtest: {len(backtest_dates)} periods")
-        
+
         results_list = []
         weights_list = []
-        
+        filtered_panel = self.returns_data[self.final_tickers]
+
+        if n_jobs != 1:
+            # Process-parallel path: ship each window to a worker process.
+            # Each worker pickles its own estimator, so per-window estimation
+            # (not the sequential rolling cache) is used.
+            from joblib import Parallel, delayed
+
+            self.logger.info(f"Solving windows in parallel (n_jobs={n_jobs})")
+            window_outputs = Parallel(n_jobs=n_jobs, backend='loky')(
+                delayed(_solve_backtest_window)(
+                    self.covariance_estimator, filtered_panel, self.final_tickers,
+                    self.constraints, est_start, est_end, oos_date
+                )
+                for est_start, est_end, oos_date in backtest_dates
+            )
+
+            for (est_start, est_end, oos_date), optimization_results in zip(backtest_dates, window_outputs):
+                if optimization_results is None:
+                    continue
+                try:
+                    period_results, weight_record = self._build_period_records(
+                        optimization_results, filtered_panel, est_start, est_end, oos_date
+                    )
+                    results_list.append(period_results)
+                    weights_list.append(weight_record)
+                except Exception as e:
+                    self.logger.warning(f"Error processing period {oos_date}: {e}")
+                    continue
+
+            return self._finalize_backtest_frames(results_list, weights_list)
+
+        # Incremental covariance path: when the filtered panel is complete,
+        # consecutive windows differ by one row, so the sample and Ledoit-Wolf
+        # estimates can be slid forward in O(n^2) instead of rebuilt in O(n^2 T)
+        use_rolling = not filtered_panel.isna().any().any()
+        rolling_cov = None
+        prev_start_pos = None
+        prev_end_pos = None
+        panel_values = filtered_panel.values if use_rolling else None
+
         # Progress bar setup
         if save_progress:
             iterator = tqdm(backtest_dates, desc="Processing periods")
         else:
             iterator = backtest_dates
-            
+
         for est_start, est_end, oos_date in iterator:
             try:
-                # Get out-of-sample returns
-                filtered_returns = self.returns_data[self.final_tickers].copy()
-                
-                if oos_date not in filtered_returns.index:
+                if oos_date not in filtered_panel.index:
                     continue
-                    
-                oos_returns = filtered_returns.loc[oos_date]
-                
+
+                oos_returns = filtered_panel.loc[oos_date]
+
                 # Skip if too many missing returns
                 if oos_returns.isna().sum() > len(self.final_tickers) * 0.2:
                     continue
-                    
+
                 # Optimize portfolio
-                optimization_results = self.optimize_portfolio(
-                    est_start, est_end, method='both'
-                )
-                
-                # Process results for both methods
-                period_results = {
-                    'date': oos_date,
-                    'estimation_start': est_start,
-                    'estimation_end': est_end,
-                    'estimation_periods': len(filtered_returns.loc[est_start:est_end])
-                }
-                
-                weight_record = {'date': oos_date}
-                
-                # Process sample and Ledoit-Wolf results
-                for method in ['sample', 'ledoit_wolf']:
-                    if method in optimization_results and 'error' not in optimization_results[method]:
-                        result = optimization_results[method]
-                        weights = result['weights']
-                        
-                        # Calculate out-of-sample return
-                        oos_vec = oos_returns.reindex(result['tickers']).fillna(0).values
-                        oos_return = float(np.dot(weights, oos_vec))
-                        
-                        method_prefix = 'sample' if method == 'sample' else 'lw'
-                        
-                        period_results.update({
-                            f'{method_prefix}_return': oos_return,
-                            f'{method_prefix}_volatility': result['metrics']['portfolio_volatility_annual'],
-                            f'{method_prefix}_num_positions': result['metrics']['num_positions'],
-                            f'{method_prefix}_max_position': result['metrics']['max_position'],
-                            f'{method_prefix}_long_exposure': result['metrics']['long_exposure'],
-                            f'{method_prefix}_short_exposure': result['metrics']['short_exposure'],
-                            f'{method_prefix}_gross_exposure': result['metrics']['gross_exposure']
-                        })
-                        
-                        if method == 'ledoit_wolf':
-                            period_results[f'{method_prefix}_shrinkage'] = result['shrinkage']
-                            
-                        # Store weights
-                        for ticker, weight in zip(result['tickers'], weights):
-                            weight_record[f'{ticker}_{method_prefix}'] = weight
-                            
-                        # Fill NaN for missing tickers
-                        for ticker in self.final_tickers:
-                            if f'{ticker}_{method_prefix}' not in weight_record:
-                                weight_record[f'{ticker}_{method_prefix}'] = np.nan
+                if use_rolling:
+                    start_pos = filtered_panel.index.get_loc(est_start)
+                    end_pos = filtered_panel.index.get_loc(est_end)
+
+                    if (rolling_cov is not None
+                            and start_pos == prev_start_pos + 1
+                            and end_pos == prev_end_pos + 1):
+                        # Window slid forward by one observation
+                        rolling_cov.push(panel_values[end_pos], panel_values[prev_start_pos])
                     else:
-                        # Fill with NaN if optimization failed
-                        method_prefix = 'sample' if method == 'sample' else 'lw'
-                        period_results.update({
-                            f'{method_prefix}_return': np.nan,
-                            f'{method_prefix}_volatility': np.nan,
-                            f'{method_prefix}_num_positions': np.nan,
-                            f'{method_prefix}_max_position': np.nan,
-                            f'{method_prefix}_long_exposure': np.nan,
-                            f'{method_prefix}_short_exposure': np.nan,
-                            f'{method_prefix}_gross_exposure': np.nan
-                        })
-                        
-                        if method == 'ledoit_wolf':
-                            period_results[f'{method_prefix}_shrinkage'] = np.nan
-                            
-                        for ticker in self.final_tickers:
-                            weight_record[f'{ticker}_{method_prefix}'] = np.nan
-                            
+                        rolling_cov = RollingCovariance(panel_values[start_pos:end_pos + 1])
+
+                    prev_start_pos, prev_end_pos = start_pos, end_pos
+
+                    lw_cov, lw_shrinkage = rolling_cov.ledoit_wolf_covariance()
+                    optimization_results = self.covariance_estimator.optimize_from_covariances(
+                        rolling_cov.sample_covariance(),
+                        lw_cov,
+                        lw_shrinkage,
+                        pd.Series(rolling_cov.mean, index=self.final_tickers),
+                        self.final_tickers,
+                        self.constraints,
+                        method='both'
+                    )
+                else:
+                    optimization_results = self.optimize_portfolio(
+                        est_start, est_end, method='both'
+                    )
+
+                period_results, weight_record = self._build_period_records(
+                    optimization_results, filtered_panel, est_start, est_end, oos_date
+                )
                 results_list.append(period_results)
                 weights_list.append(weight_record)
-                
+
             except Exception as e:
                 self.logger.warning(f"Error processing period {oos_date}: {e}")
                 continue
-                
-        # Convert to DataFrames
+
+        return self._finalize_backtest_frames(results_list, weights_list)
+
+    def _build_period_records(self,
+                             optimization_results: Dict,
+                             filtered_returns: pd.DataFrame,
+                             est_start: pd.Timestamp,
+                             est_end: pd.Timestamp,
+                             oos_date: pd.Timestamp) -> Tuple[Dict, Dict]:
+        """
+        Assemble the per-period result and weight records for both methods
+
+        Returns:
+        --------
+        Tuple[Dict, Dict]
+            (period_results, weight_record)
+        """
+
+        oos_returns = filtered_returns.loc[oos_date]
+
+        # Process results for both methods
+        period_results = {
+            'date': oos_date,
+            'estimation_start': est_start,
+            'estimation_end': est_end,
+            'estimation_periods': len(filtered_returns.loc[est_start:est_end])
+        }
+
+        # One weight row per method instead of a dict of 2n scalar entries;
+        # the rows are stacked into a single 2-D array when the backtest ends
+        n_tickers = len(self.final_tickers)
+        ticker_positions = {ticker: i for i, ticker in enumerate(self.final_tickers)}
+        weight_rows = {
+            'sample': np.full(n_tickers, np.nan),
+            'lw': np.full(n_tickers, np.nan)
+        }
+
+        # Process sample and Ledoit-Wolf results
+        for method in ['sample', 'ledoit_wolf']:
+            method_prefix = 'sample' if method == 'sample' else 'lw'
+
+            if method in optimization_results and 'error' not in optimization_results[method]:
+                result = optimization_results[method]
+                weights = result['weights']
+
+                # Calculate out-of-sample return
+                oos_vec = oos_returns.reindex(result['tickers']).fillna(0).values
+                oos_return = float(np.dot(weights, oos_vec))
+
+                period_results.update({
+                    f'{method_prefix}_return': oos_return,
+                    f'{method_prefix}_volatility': result['metrics']['portfolio_volatility_annual'],
+                    f'{method_prefix}_num_positions': result['metrics']['num_positions'],
+                    f'{method_prefix}_max_position': result['metrics']['max_position'],
+                    f'{method_prefix}_long_exposure': result['metrics']['long_exposure'],
+                    f'{method_prefix}_short_exposure': result['metrics']['short_exposure'],
+                    f'{method_prefix}_gross_exposure': result['metrics']['gross_exposure']
+                })
+
+                if method == 'ledoit_wolf':
+                    period_results[f'{method_prefix}_shrinkage'] = result['shrinkage']
+
+                # Store weights; tickers missing from this window stay NaN
+                row = weight_rows[method_prefix]
+                for ticker, weight in zip(result['tickers'], weights):
+                    row[ticker_positions[ticker]] = weight
+            else:
+                # Fill with NaN if optimization failed
+                period_results.update({
+                    f'{method_prefix}_return': np.nan,
+                    f'{method_prefix}_volatility': np.nan,
+                    f'{method_prefix}_num_positions': np.nan,
+                    f'{method_prefix}_max_position': np.nan,
+                    f'{method_prefix}_long_exposure': np.nan,
+                    f'{method_prefix}_short_exposure': np.nan,
+                    f'{method_prefix}_gross_exposure': np.nan
+                })
+
+                if method == 'ledoit_wolf':
+                    period_results[f'{method_prefix}_shrinkage'] = np.nan
+
+        return period_results, (oos_date, weight_rows['sample'], weight_rows['lw'])
+
+    def _finalize_backtest_frames(self,
+                                 results_list: List[Dict],
+                                 weights_list: List[Tuple]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Convert accumulated period records to the result DataFrames"""
         if not results_list:
             raise ValueError("No valid backtest periods found")
-            
+
         self.backtest_results = pd.DataFrame(results_list)
         self.backtest_results.set_index('date', inplace=True)
         self.backtest_results.sort_index(inplace=True)
-        
-        self.portfolio_weights = pd.DataFrame(weights_list)
-        if len(self.portfolio_weights) > 0:
-            self.portfolio_weights.set_index('date', inplace=True)
+
+        # Bulk-build the weights frame from the stacked per-period rows rather
+        # than one dict entry per (ticker, method) cell
+        if weights_list:
+            weight_dates = [record[0] for record in weights_list]
+            sample_block = np.vstack([record[1] for record in weights_list])
+            lw_block = np.vstack([record[2] for record in weights_list])
+
+            self.portfolio_weights = pd.DataFrame(
+                np.hstack([sample_block, lw_block]),
+                index=pd.Index(weight_dates, name='date'),
+                columns=([f'{ticker}_sample' for ticker in self.final_tickers]
+                         + [f'{ticker}_lw' for ticker in self.final_tickers])
+            )
             self.portfolio_weights.sort_index(inplace=True)
-            
+        else:
+            self.portfolio_weights = pd.DataFrame(weights_list)
+
         return self.backtest_results, self.portfolio_weights
         
     def analyze_performance(self) -> Dict:
@@ -435,15 +585,17 @@ class PortfolioOptimizer:
             self.risk_free_rate
         )
         
-    def run_complete_analysis(self, db_connection=None) -> Dict:
+    def run_complete_analysis(self, db_connection=None, n_jobs: int = 1) -> Dict:
         """
         Execute complete portfolio optimization workflow
-        
+
         Parameters:
         -----------
         db_connection : wrds.Connection, optional
             WRDS database connection
-            
+        n_jobs : int
+            Worker processes for the backtest windows (see run_backtest)
+
         Returns:
         --------
         Dict
@@ -461,7 +613,7 @@ class PortfolioOptimizer:
             self.validate_tickers()
             
             # 4. Run backtest
-            self.run_backtest()
+            self.run_backtest(n_jobs=n_jobs)
             
             # 5. Analyze performance
             performance_results = self.analyze_performance()
@@ -0,0 +1,124 @@
+# src/portfolio/rolling_covariance.py
+"""
+Incremental covariance estimation for rolling window backtests
+Maintains running sums so consecutive windows cost O(n^2) instead of O(n^2 T)
+"""
+
+import numpy as np
+import logging
+from typing import Optional, Tuple
+
+class RollingCovariance:
+    """
+    Maintains sufficient statistics for the sample and Ledoit-Wolf covariance
+    of a sliding window of return observations.
+
+    Sequential monthly estimation windows differ by a single row, so instead of
+    rebuilding np.cov / LedoitWolf().fit from scratch each rebalance, this
+    helper stores S1 = sum(x_i) and S2 = sum(x_i x_i^T) and updates them by
+    adding the new row and subtracting the evicted one. The window rows are
+    kept in a ring buffer so the Ledoit-Wolf b^2 term can be computed from
+    properly centered rows (an O(T n) pass, negligible next to the O(n^2)
+    sums it sits beside).
+    """
+
+    def __init__(self, window: np.ndarray):
+        """
+        Initialize from a full estimation window
+
+        Parameters:
+        -----------
+        window : np.ndarray
+            (T, n) array of return observations with no missing values
+        """
+
+        window = np.asarray(window, dtype=np.float64)
+        if window.ndim != 2 or window.shape[0] < 2:
+            raise ValueError("Window must be a 2-D array with at least 2 observations")
+
+        self.n_obs = window.shape[0]
+        self.n_assets = window.shape[1]
+        self.S1 = window.sum(axis=0)
+        self.S2 = window.T @ window
+        # Ring buffer of the raw rows; the LW b^2 term needs centered fourth
+        # moments, which cannot be slid incrementally because the mean moves
+        self._window = window.copy()
+        self._head = 0
+        self.logger = logging.getLogger(__name__)
+
+    def push(self, x_new: np.ndarray, x_old: np.ndarray) -> None:
+        """
+        Slide the window forward by one observation
+
+        Parameters:
+        -----------
+        x_new : np.ndarray
+            Row entering the window
+        x_old : np.ndarray
+            Row leaving the window
+        """
+
+        x_new = np.asarray(x_new, dtype=np.float64)
+        x_old = np.asarray(x_old, dtype=np.float64)
+
+        self.S1 += x_new - x_old
+        self.S2 += np.outer(x_new, x_new) - np.outer(x_old, x_old)
+        # Overwrite the evicted row in place; row order within the buffer
+        # does not affect any of the statistics
+        self._window[self._head] = x_new
+        self._head = (self._head + 1) % self.n_obs
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean return vector of the current window"""
+        return self.S1 / self.n_obs
+
+    def sample_covariance(self) -> np.ndarray:
+        """Unbiased (n-1 denominator) sample covariance of the current window"""
+
+        mean = self.mean
+        return (self.S2 - self.n_obs * np.outer(mean, mean)) / (self.n_obs - 1)
+
+    def ledoit_wolf_covariance(self) -> Tuple[np.ndarray, float]:
+        """
+        Ledoit-Wolf shrunk covariance from the running sums
+
+        Shrinks the MLE covariance S towards the scaled identity m*I with
+        intensity b^2/d^2 where m = trace(S)/n, d^2 = ||S - m*I||_F^2 and
+        b^2 estimates the variance of S around the true covariance
+        (Ledoit & Wolf 2004, "A well-conditioned estimator...").
+
+        Returns:
+        --------
+        Tuple[np.ndarray, float]
+            (lw_cov, shrinkage)
+        """
+
+        t = self.n_obs
+        n = self.n_assets
+        mean = self.mean
+
+        # MLE covariance (1/T denominator) to match the sklearn convention
+        S = self.S2 / t - np.outer(mean, mean)
+
+        m = np.trace(S) / n
+        d2 = np.sum((S - m * np.eye(n)) ** 2)
+
+        if d2 <= 0:
+            return S.copy(), 0.0
+
+        # b^2 = (1/T^2) * sum_k ||y_k y_k^T - S||_F^2 over centered rows
+        # y_k = x_k - mean, where the cross term collapses to T * ||S||_F^2
+        # because S = (1/T) sum_k y_k y_k^T. The centered fourth moments are
+        # recomputed per window - they cannot be slid because the mean moves -
+        # which keeps this estimator identical to the direct one
+        centered = self._window - mean
+        sum_norm4 = (np.einsum('ij,ij->i', centered, centered) ** 2).sum()
+        frob_S = np.sum(S ** 2)
+        b2_bar = sum_norm4 / t ** 2 - frob_S / t
+        b2 = min(max(b2_bar, 0.0), d2)
+
+        shrinkage = b2 / d2
+        lw_cov = shrinkage * m * np.eye(n) + (1.0 - shrinkage) * S
+
+        return lw_cov, shrinkage
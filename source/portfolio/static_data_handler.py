@@ -42,27 +42,47 @@ class StaticDataHandler:
             True if data loaded successfully
         """
         
+        # Memoize: every public method funnels through load_data, so without
+        # this guard each call re-reads and re-pivots the full file
+        if self.data is not None:
+            return True
+
         try:
             if not os.path.exists(self.data_file_path):
                 self.logger.error(f"Data file not found: {self.data_file_path}")
                 return False
                 
             self.logger.info(f"Loading data from {self.data_file_path}")
+
+            # Load data, dispatching on the file extension (the download
+            # scripts default to Feather; CSV kept for compatibility)
+            if self.data_file_path.endswith('.feather'):
+                raw_data = pd.read_feather(self.data_file_path)
+            elif self.data_file_path.endswith('.parquet'):
+                raw_data = pd.read_parquet(self.data_file_path)
+            else:
+                raw_data = pd.read_csv(self.data_file_path)
             
-            # Load CSV data
-            raw_data = pd.read_csv(self.data_file_path)
-            
-            # Expected columns: date, ticker, return, [market_cap, sector]
-            required_cols = ['date', 'ticker', 'return']
-            if not all(col in raw_data.columns for col in required_cols):
-                self.logger.error(f"Missing required columns. Expected: {required_cols}")
-                return False
-                
-            # Convert date column
-            raw_data['date'] = pd.to_datetime(raw_data['date'])
-            
-            # Pivot to wide format (dates as index, tickers as columns)
-            self.data = raw_data.pivot(index='date', columns='ticker', values='return')
+            if 'ticker' in raw_data.columns:
+                # Long format - expected columns: date, ticker, return, [market_cap, sector]
+                required_cols = ['date', 'ticker', 'return']
+                if not all(col in raw_data.columns for col in required_cols):
+                    self.logger.error(f"Missing required columns. Expected: {required_cols}")
+                    return False
+
+                # Convert date column
+                raw_data['date'] = pd.to_datetime(raw_data['date'])
+
+                # Pivot to wide format (dates as index, tickers as columns)
+                self.data = raw_data.pivot(index='date', columns='ticker', values='return')
+            else:
+                # Pre-pivoted wide matrix (dates x tickers, float32) written by
+                # the download scripts' save_wide_data - no pivot needed
+                if 'date' in raw_data.columns:
+                    raw_data = raw_data.set_index('date')
+                raw_data.index = pd.to_datetime(raw_data.index)
+                self.data = raw_data
+
             self.data.sort_index(inplace=True)
             
             # Get available tickers
@@ -323,7 +323,8 @@ class PortfolioPlotter:
         
         figsize = figsize or self.default_figsize
         fig, ax = plt.subplots(figsize=figsize)
-        
+
+        portfolio_weights = self._flatten_weight_columns(portfolio_weights)
         method_suffix = '_sample' if method == 'sample' else '_lw'
         weight_cols = [col for col in portfolio_weights.columns if col.endswith(method_suffix)]
         
@@ -546,8 +547,9 @@ class PortfolioPlotter:
         """
         
         figsize = figsize or (20, 12)
+        portfolio_weights = self._flatten_weight_columns(portfolio_weights)
         fig = plt.figure(figsize=figsize)
-        fig.suptitle('Portfolio Optimization Performance Dashboard', 
+        fig.suptitle('Portfolio Optimization Performance Dashboard',
                     fontsize=20, fontweight='bold')
         
         # Create grid layout - same as original
@@ -670,7 +672,7 @@ class PortfolioPlotter:
                 returns = backtest_results[return_col].dropna()
                 if len(returns) > 0:
                     cumulative = (1 + returns).cumprod()
-                    running_max = cumulative.expanding().max()
+                    running_max = cumulative.cummax()
                     drawdown = (cumulative - running_max) / running_max
                     ax6.fill_between(drawdown.index, drawdown.values, 0,
                                    color=colors[color_key], alpha=0.6, label=label)
@@ -769,61 +771,82 @@ class PortfolioPlotter:
                     # Generate efficient frontier for both methods (only upper half)
                     min_ret = max(mean_returns.min(), risk_free_rate)  # Start from risk-free rate or min return
                     target_returns = np.linspace(min_ret, mean_returns.max() * 1.5, 30)
-                    
-                    sample_vols = []
-                    lw_vols = []
-                    
-                    for target_ret in target_returns:
-                        # Sample covariance frontier
+
+                    import cvxpy as cp
+                    from scipy.linalg import cho_factor, cho_solve
+
+                    min_weight = constraints_dict.get('min_weight')
+                    max_weight = constraints_dict.get('max_weight')
+                    ones = np.ones(len(final_tickers))
+
+                    def analytic_frontier(cov):
+                        """
+                        Sweep the frontier from one Cholesky factorization via the
+                        two-fund theorem; flag points where the box constraints
+                        bind so only those fall back to a QP solve
+                        """
+                        vols = np.full(len(target_returns), np.nan)
+                        needs_qp = np.ones(len(target_returns), dtype=bool)
+
                         try:
-                            import cvxpy as cp
-                            w = cp.Variable(len(final_tickers))
-                            portfolio_return = mean_returns.T @ w
-                            portfolio_variance = cp.quad_form(w, sample_cov)
-                            
-                            constraints = [cp.sum(w) == 1, portfolio_return == target_ret]
-                            
-                            if constraints_dict.get('min_weight') is not None:
-                                constraints.append(w >= constraints_dict['min_weight'])
-                            if constraints_dict.get('max_weight') is not None:
-                                constraints.append(w <= constraints_dict['max_weight'])
-                            
-                            prob = cp.Problem(cp.Minimize(portfolio_variance), constraints)
-                            prob.solve(verbose=False)
-                            
-                            if prob.status == cp.OPTIMAL:
-                                sample_vols.append(np.sqrt(prob.value) * np.sqrt(12))
-                            else:
-                                sample_vols.append(np.nan)
-                        except:
-                            sample_vols.append(np.nan)
-                            
-                        # Ledoit-Wolf frontier
+                            factor = cho_factor(cov, lower=True)
+                            a = cho_solve(factor, ones)
+                            b = cho_solve(factor, mean_returns)
+                        except np.linalg.LinAlgError:
+                            return vols, needs_qp
+
+                        A = ones @ a
+                        B = mean_returns @ a
+                        C = mean_returns @ b
+                        D = A * C - B ** 2
+
+                        if A <= 0 or D <= 0:
+                            return vols, needs_qp
+
+                        for i, target_ret in enumerate(target_returns):
+                            weights = ((C - B * target_ret) * a + (A * target_ret - B) * b) / D
+
+                            if min_weight is not None and (weights < min_weight - 1e-9).any():
+                                continue
+                            if max_weight is not None and (weights > max_weight + 1e-9).any():
+                                continue
+
+                            variance = (A * target_ret ** 2 - 2 * B * target_ret + C) / D
+                            vols[i] = np.sqrt(max(variance, 0.0)) * np.sqrt(12)
+                            needs_qp[i] = False
+
+                        return vols, needs_qp
+
+                    def qp_volatility(cov, target_ret):
+                        """Single constrained frontier point (bounds active)"""
                         try:
                             w = cp.Variable(len(final_tickers))
                             portfolio_return = mean_returns.T @ w
-                            portfolio_variance = cp.quad_form(w, lw_cov)
-                            
+                            portfolio_variance = cp.quad_form(w, cov)
+
                             constraints = [cp.sum(w) == 1, portfolio_return == target_ret]
-                            
-                            if constraints_dict.get('min_weight') is not None:
-                                constraints.append(w >= constraints_dict['min_weight'])
-                            if constraints_dict.get('max_weight') is not None:
-                                constraints.append(w <= constraints_dict['max_weight'])
-                            
+
+                            if min_weight is not None:
+                                constraints.append(w >= min_weight)
+                            if max_weight is not None:
+                                constraints.append(w <= max_weight)
+
                             prob = cp.Problem(cp.Minimize(portfolio_variance), constraints)
                             prob.solve(verbose=False)
-                            
+
                             if prob.status == cp.OPTIMAL:
-                                lw_vols.append(np.sqrt(prob.value) * np.sqrt(12))
-                            else:
-                                lw_vols.append(np.nan)
+                                return np.sqrt(prob.value) * np.sqrt(12)
                         except:
-                            lw_vols.append(np.nan)
-                    
-                    # Plot efficient frontiers
-                    sample_vols = np.array(sample_vols)
-                    lw_vols = np.array(lw_vols)
+                            pass
+                        return np.nan
+
+                    sample_vols, sample_needs_qp = analytic_frontier(sample_cov)
+                    lw_vols, lw_needs_qp = analytic_frontier(lw_cov)
+
+                    for i in np.nonzero(sample_needs_qp)[0]:
+                        sample_vols[i] = qp_volatility(sample_cov, target_returns[i])
+                    for i in np.nonzero(lw_needs_qp)[0]:
+                        lw_vols[i] = qp_volatility(lw_cov, target_returns[i])
                     
                     sample_valid = ~np.isnan(sample_vols)
                     lw_valid = ~np.isnan(lw_vols)
@@ -928,6 +951,7 @@ class PortfolioPlotter:
         """
         
         figsize = figsize or (14, 10)
+        portfolio_weights = self._flatten_weight_columns(portfolio_weights)
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize)
         fig.suptitle('Portfolio Summary: Weights & Performance', fontsize=16, fontweight='bold')
         
@@ -1186,7 +1210,7 @@ class PortfolioPlotter:
                 returns = backtest_results[return_col].dropna()
                 if len(returns) > 0:
                     cumulative = (1 + returns).cumprod()
-                    running_max = cumulative.expanding().max()
+                    running_max = cumulative.cummax()
                     drawdown = (cumulative - running_max) / running_max
                     ax6.fill_between(drawdown.index, drawdown.values, 0,
                                    color=colors[color_key], alpha=0.6, label=label)
@@ -1297,9 +1321,23 @@ class PortfolioPlotter:
         
         return fig
         
+    @staticmethod
+    def _flatten_weight_columns(portfolio_weights: pd.DataFrame) -> pd.DataFrame:
+        """
+        Accept (ticker, method) MultiIndex weight columns alongside the legacy
+        flat '{ticker}_{method}' labels by flattening the former on entry
+        """
+
+        if isinstance(portfolio_weights.columns, pd.MultiIndex):
+            flat = portfolio_weights.copy()
+            flat.columns = [f'{ticker}_{method}' for ticker, method in portfolio_weights.columns]
+            return flat
+        return portfolio_weights
+
     def _calculate_turnover(self, weights_df: pd.DataFrame, method: str = 'sample') -> pd.Series:
         """Calculate portfolio turnover for plotting"""
-        
+
+        weights_df = self._flatten_weight_columns(weights_df)
         method_suffix = '_sample' if method == 'sample' else '_lw'
         weight_cols = [col for col in weights_df.columns if col.endswith(method_suffix)]
         